@@ -18,19 +18,27 @@ Usage:
     python reddit_thread_scraper.py "<thread_url>" --min_score 4
     # Optional: allow comments with no numbers (not recommended):
     python reddit_thread_scraper.py "<thread_url>" --allow_no_numbers
+    # Thread JSON is cached for an hour under ~/.cache/reddit_thread_scraper; to bypass it:
+    python reddit_thread_scraper.py "<thread_url>" --no_cache
 """
 
 import argparse
+import base64
 import csv
+import hashlib
 import html
+import http.client
 import json
+import operator
 import os
 import re
 import sys
+import threading
 import time
+import urllib.error
 import urllib.parse
 import urllib.request
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List, Optional, Tuple
 
 UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
@@ -42,21 +50,39 @@ RE_MONEY = re.compile(
         (?P<currency>[$€£])
         \s*
     )?
-    (?P<number>\d{1,3}(?:[.,]\d{3})*(?:[.,]\d+)?|\d+(?:[.,]\d+)?)
+    # atomic (lookahead + backref): a number is never re-split on backtracking
+    (?=(?P<number>\d{1,3}(?:[.,]\d{3})*(?:[.,]\d+)?|\d+(?:[.,]\d+)?))(?P=number)
     \s*
-    (?P<suffix>[kKmMbB]|million|millions|thousand|k)?
+    (?P<suffix>(?:[kKmMbB]|millions?|thousand)\b)?
     \s*
-    (?P<per>/\s*(?:h|hr|hour|day|week|mo|month|yr|year|per\s*(?:hour|day|week|month|year)))?
+    (?P<per>/\s*(?:h|hrs?|hours?|days?|weeks?|mos?|months?|yrs?|years?|per\s*(?:hour|day|week|month|year)s?)\b)?
     """,
-    re.VERBOSE
+    re.VERBOSE | re.I
 )
 
+# Thousands separators / spaces dropped from a money number in one pass
+MONEY_STRIP = str.maketrans("", "", ", ")
+
 # --- Heuristics: other quantitative evidence ---
 RE_DURATION = re.compile(r"\b\d{1,4}(?:[.,]\d+)?\s*(?:hours?|hrs?|h|days?|d|weeks?|w|months?|mos?|mo|years?|yrs?)\b", re.I)
 RE_RATE = re.compile(r"\b\d{1,4}(?:[.,]\d+)?\s*(?:per|/)\s*(?:hour|hr|day|week|month|mo|year|yr)s?\b", re.I)
 RE_COUNT = re.compile(r"\b\d{1,4}\s*(?:clients?|customers?|users?|leads?|emails?|meetings?|calls?|tickets?|demos?)\b", re.I)
 RE_PERCENT = re.compile(r"\b\d{1,3}(?:[.,]\d+)?\s*%\b")
 
+# Cheap gate: every pattern above needs a digit
+RE_DIGIT = re.compile(r"\d")
+
+# All of the above fused into one alternation, scanned once per comment.
+# Specific kinds come first: RE_MONEY matches any bare number and would
+# otherwise swallow durations, rates and counts.
+RE_QUANT = re.compile("|".join([
+    r"(?P<percent>" + RE_PERCENT.pattern + r")",
+    r"(?P<rate>(?i:" + RE_RATE.pattern + r"))",
+    r"(?P<count>(?i:" + RE_COUNT.pattern + r"))",
+    r"(?P<duration>(?i:" + RE_DURATION.pattern + r"))",
+    r"(?P<money>(?ix:" + RE_MONEY.pattern + r"))",
+]))
+
 # Other topic signals
 KEYWORDS_SELL = [
     "client", "clients", "customer", "customers", "sold", "selling", "sell",
@@ -78,6 +104,45 @@ MARKET_HINTS = [
     "helpdesk", "hotel", "hospitality", "travel", "logistics"
 ]
 
+def keyword_regex(words: List[str]) -> re.Pattern:
+    """Single case-insensitive alternation (longest first) anchored at a word start.
+
+    The rest of the word may follow ("ecom" matches "ecommerce", plurals
+    match), and findall() returns the keyword itself.
+    """
+    alts = "|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+    return re.compile(r"\b(" + alts + r")\w*", re.I)
+
+# Selling/agent checks are plain word lookups: tokenize once, intersect sets.
+# (Multi-word entries like "ai agent" are covered by their single-word form.)
+# Letters only, so "gpt4o" / "$50mrr" still yield "gpt" / "mrr".
+RE_WORD = re.compile(r"[a-z]+")
+# Longer forms the substring tests used to catch, beyond plurals (see word_set)
+SELL_WORDS = frozenset([k.lower() for k in KEYWORDS_SELL if " " not in k]
+                       + ["contractor", "contracting", "freelancer", "priced"])
+AGENT_WORDS = frozenset([k.lower() for k in KEYWORDS_AGENT if " " not in k]
+                        + ["agentic", "chatgpt", "chatbot"])
+RE_MARKET = keyword_regex(MARKET_HINTS)
+
+def word_set(text: str) -> set:
+    """Tokens of text, plus the singular of plural ones ("agents" -> "agent", "agencies" -> "agency")."""
+    words = set(RE_WORD.findall(text))
+    words.update([w[:-3] + "y" if w.endswith("ies") else w[:-1] for w in words if w.endswith("s")])
+    return words
+
+# Reason tags shared by every row (one string object each)
+REASON_SELLING = sys.intern("selling_keywords")
+REASON_AGENT = sys.intern("agent_keywords")
+REASON_MONEY = sys.intern("money_mention")
+REASON_MARKET = sys.intern("market_hint")
+REASON_NARRATIVE = sys.intern("narrative_signal")
+REASON_NUMBERS = sys.intern("has_numbers")
+
+NARRATIVE_CUES = (" we ", " i ", " my ", " our ", "case study", "story")
+
+def _unescape(s: str) -> str:
+    return html.unescape(s) if "&" in s else s
+
 def to_json_url(url: str) -> str:
     if url.endswith(".json"):
         return url
@@ -85,20 +150,129 @@ def to_json_url(url: str) -> str:
         url += "/"
     return url + ".json"
 
+# Keep-alive connections, one per (scheme, host) and per thread
+# (http.client connections are not thread-safe).
+_conn_local = threading.local()
+
+def _proxy(scheme: str, host: str) -> Optional[urllib.parse.SplitResult]:
+    """Proxy urlopen would use for this host (HTTP(S)_PROXY / NO_PROXY), or None."""
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    return urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+def _connection(scheme: str, host: str) -> Tuple[http.client.HTTPConnection, Optional[Dict[str, str]], bool]:
+    """(connection, forward_headers, reused). forward_headers is set when requests go
+    through a plain-HTTP proxy, which wants the absolute URL plus those headers."""
+    conns = _conn_local.__dict__.setdefault("conns", {})
+    entry = conns.get((scheme, host))
+    if entry is not None:
+        return (*entry, True)
+    proxy = _proxy(scheme, host)
+    forward = None
+    if proxy is None:
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = cls(host)
+    else:
+        auth = {}
+        if proxy.username:
+            cred = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+            auth["Proxy-Authorization"] = "Basic " + base64.b64encode(cred.encode("utf-8")).decode("ascii")
+        port = proxy.port or (443 if proxy.scheme == "https" else 80)
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(proxy.hostname, port)
+            conn.set_tunnel(host, headers=auth)  # CONNECT, then TLS to the real host
+        else:
+            conn = http.client.HTTPConnection(proxy.hostname, port)
+            forward = auth
+    conns[(scheme, host)] = (conn, forward)
+    return conn, forward, False
+
+def _drop_connection(scheme: str, host: str) -> None:
+    entry = _conn_local.__dict__.get("conns", {}).pop((scheme, host), None)
+    if entry is not None:
+        entry[0].close()
+
+def http_request(url: str, method: str = "GET", body: Optional[bytes] = None,
+                 headers: Optional[Dict[str, str]] = None, timeout: float = 20, max_redirects: int = 5) -> bytes:
+    """Send a request over a reused keep-alive connection, following redirects."""
+    for _ in range(max_redirects + 1):
+        parts = urllib.parse.urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        hdrs = {"User-Agent": UA, "Connection": "keep-alive", **(headers or {})}
+        while True:
+            conn, forward, reused = _connection(parts.scheme, parts.netloc)
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            try:
+                if forward is None:
+                    conn.request(method, path, body=body, headers=hdrs)
+                else:
+                    conn.request(method, f"{parts.scheme}://{parts.netloc}{path}", body=body, headers={**hdrs, **forward})
+                resp = conn.getresponse()
+                data = resp.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                _drop_connection(parts.scheme, parts.netloc)
+                if not reused:
+                    raise
+                # server closed the idle keep-alive connection: retry once on a fresh one
+            except (http.client.HTTPException, OSError):
+                # timeouts and other errors are not replayed (a POST may already have been processed)
+                _drop_connection(parts.scheme, parts.netloc)
+                raise
+        if resp.will_close:
+            _drop_connection(parts.scheme, parts.netloc)
+        location = resp.getheader("Location")
+        if resp.status in (301, 302, 303, 307, 308) and location:
+            url = urllib.parse.urljoin(url, location)
+            if resp.status == 303:
+                method, body = "GET", None
+            continue
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        return data
+    raise urllib.error.URLError(f"too many redirects: {url}")
+
 def http_get(url: str, retries: int = 3, backoff: float = 1.2) -> bytes:
     last_err = None
     for i in range(retries):
         try:
-            req = urllib.request.Request(url, headers={"User-Agent": UA})
-            with urllib.request.urlopen(req, timeout=20) as resp:
-                return resp.read()
+            return http_request(url)
         except Exception as e:
             last_err = e
             time.sleep(backoff * (i + 1))
     raise last_err
 
-def load_thread(url: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "reddit_thread_scraper",
+)
+CACHE_TTL = 3600  # seconds
+
+def http_get_cached(url: str, ttl: float = CACHE_TTL) -> bytes:
+    """http_get with an on-disk cache (one file per URL hash) so re-runs skip the download."""
+    path = os.path.join(CACHE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest())
+    try:
+        if time.time() - os.path.getmtime(path) < ttl:
+            with open(path, "rb") as f:
+                return f.read()
+    except OSError:
+        pass
     data = http_get(url)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # cache is best-effort
+    return data
+
+def load_thread(url: str, use_cache: bool = True) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    data = http_get_cached(url) if use_cache else http_get(url)
     parsed = json.loads(data.decode("utf-8"))
     if not isinstance(parsed, list) or len(parsed) < 2:
         raise ValueError("Unexpected Reddit JSON format")
@@ -107,73 +281,81 @@ def load_thread(url: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
     return post_listing, comments_listing
 
 def flatten_comments(children: List[Dict[str, Any]], depth=0) -> List[Dict[str, Any]]:
+    """Pre-order walk with an explicit stack (deep threads would hit the recursion limit)."""
     rows = []
-    for ch in children:
-        kind = ch.get("kind")
-        data = ch.get("data", {})
-        if kind == "t1":  # comment
-            rows.append({**data, "_depth": depth})
+    stack = [(iter(children), depth)]
+    while stack:
+        it, depth = stack[-1]
+        for ch in it:
+            if ch.get("kind") != "t1":  # "more" stubs etc.
+                continue
+            data = ch.get("data", {})
+            data["_depth"] = depth
+            rows.append(data)
             replies = data.get("replies")
             if isinstance(replies, dict):
-                rows.extend(flatten_comments(replies.get("data", {}).get("children", []), depth + 1))
-        elif kind == "more":
-            continue
+                kids = replies.get("data", {}).get("children")
+                if kids:
+                    stack.append((iter(kids), depth + 1))
+                    break
+        else:
+            stack.pop()
     return rows
 
 def has_quantitative(text: str) -> Tuple[bool, Dict[str, List[str]]]:
     """Returns True if the text includes money OR other quantitative metrics."""
-    money = [m.group(0) for m in RE_MONEY.finditer(text)]
-    duration = [m.group(0) for m in RE_DURATION.finditer(text)]
-    rate = [m.group(0) for m in RE_RATE.finditer(text)]
-    count = [m.group(0) for m in RE_COUNT.finditer(text)]
-    percent = [m.group(0) for m in RE_PERCENT.finditer(text)]
-    any_num = bool(money or duration or rate or count or percent)
-    return any_num, {
-        "money": money, "duration": duration, "rate": rate, "count": count, "percent": percent
-    }
-
-def score_comment(body: str) -> Tuple[int, Dict[str, Any]]:
-    text = body.lower()
+    buckets: Dict[str, List[str]] = {k: [] for k in ("money", "duration", "rate", "count", "percent")}
+    for m in RE_QUANT.finditer(text):
+        kind = m.lastgroup
+        buckets[kind].append(m.group(0))
+        if kind == "money" and m.group("currency"):
+            # "$5 per month": the money match starts at "$" and would hide the rate
+            rate = RE_RATE.match(text, m.start("number"))
+            if rate:
+                buckets["rate"].append(rate.group(0))
+    any_num = any(buckets.values())
+    return any_num, buckets
+
+def score_comment(text: str) -> Tuple[int, List[str], Dict[str, Any]]:
+    """Heuristic score of an already-lowercased comment body."""
     reasons = []
     score = 0
+    words = word_set(text)
 
-    if any(k in text for k in KEYWORDS_SELL):
+    if not SELL_WORDS.isdisjoint(words):
         score += 2
-        reasons.append("selling_keywords")
+        reasons.append(REASON_SELLING)
 
-    if any(k in text for k in KEYWORDS_AGENT):
+    if not AGENT_WORDS.isdisjoint(words):
         score += 2
-        reasons.append("agent_keywords")
+        reasons.append(REASON_AGENT)
 
     money_matches = list(RE_MONEY.finditer(text))
     if money_matches:
         score += min(3, len(money_matches))
-        reasons.append("money_mention")
+        reasons.append(REASON_MONEY)
 
-    markets = [m for m in MARKET_HINTS if m in text]
+    markets = list(dict.fromkeys(RE_MARKET.findall(text)))
     if markets:
         score += 1
-        reasons.append("market_hint")
+        reasons.append(REASON_MARKET)
 
-    if any(w in text for w in [" we ", " i ", " my ", " our ", "case study", "story"]):
+    if any(w in text for w in NARRATIVE_CUES):
         score += 1
-        reasons.append("narrative_signal")
+        reasons.append(REASON_NARRATIVE)
 
     details = {
-        "money_spans": [m.group(0) for m in money_matches],
+        "money_matches": money_matches,
         "markets_found": markets
     }
-    return score, details
+    return score, reasons, details
 
-def normalize_money(token: str) -> Optional[str]:
-    m = RE_MONEY.search(token.lower())
-    if not m:
-        return None
-    num = m.group("number").replace(",", "").replace(" ", "")
+def normalize_money(m: re.Match) -> Optional[str]:
+    num = m.group("number").translate(MONEY_STRIP)
     try:
         val = float(num)
-    except:
-        return token
+    except (ValueError, TypeError):
+        return m.group(0)
     suffix = m.group("suffix")
     currency = m.group("currency") or ""
     per = m.group("per")
@@ -183,22 +365,19 @@ def normalize_money(token: str) -> Optional[str]:
         val *= 1_000
     base = f"{currency}{int(val) if float(val).is_integer() else round(val, 2)}"
     if per:
-        base += " " + per.replace("/", "").strip()
+        base += " " + per.replace("/", "").strip().lower()
     return base
 
-def extract_best_money(money_spans: List[str]) -> Optional[str]:
-    if not money_spans:
+def extract_best_money(money_matches: List[re.Match]) -> Optional[str]:
+    if not money_matches:
         return None
     best = None
     best_val = -1.0
-    for tok in money_spans:
-        m = RE_MONEY.search(tok.lower())
-        if not m:
-            continue
-        num = m.group("number").replace(",", "").replace(" ", "")
+    for m in money_matches:
+        num = m.group("number").translate(MONEY_STRIP)
         try:
             val = float(num)
-        except:
+        except (ValueError, TypeError):
             continue
         suf = m.group("suffix")
         if suf and suf.lower().startswith("m"):
@@ -207,64 +386,121 @@ def extract_best_money(money_spans: List[str]) -> Optional[str]:
             val *= 1_000
         if val > best_val:
             best_val = val
-            best = tok
+            best = m
     return normalize_money(best) if best else None
 
+CSV_HEADER = [
+    "thread_title","subreddit","thread_author","thread_url","thread_created_utc",
+    "comment_score","comment_author","comment_ups","extracted_revenue",
+    "target_market","service_description","quantitative_evidence","permalink","body"
+]
+
+# Per-comment columns, fetched from a row dict in one C-level call
+CSV_ROW_FIELDS = operator.itemgetter(
+    "score", "author", "ups", "extracted_revenue",
+    "target_market", "service_description", "quantitative_evidence", "permalink", "body"
+)
+CSV_BUFFER = 1 << 20
+
+def csv_row(thread_meta: List[Any], r: Dict[str, Any]) -> List[Any]:
+    return [*thread_meta, *CSV_ROW_FIELDS(r)]
+
 def summarize_text(text: str, limit: int = 240) -> str:
+    if len(text) > limit * 4:
+        # Long comment: the collapsed head is a prefix of the collapsed whole,
+        # so only fall back to a full split when whitespace ate too much of it.
+        clean = " ".join(text[:limit * 4].split())
+        if len(clean) > limit:
+            return clean[:limit] + "…"
     clean = " ".join(text.split())
     return clean[:limit] + ("…" if len(clean) > limit else "")
 
-def maybe_llm_refine(rows: List[Dict[str, Any]], thread_title: str) -> None:
+LLM_URL = "https://api.openai.com/v1/chat/completions"
+LLM_BATCH_SIZE = 20
+LLM_WORKERS = 4
+LLM_SYSTEM = (
+    "You are a concise analyst. For each Reddit comment, if it clearly describes selling an AI agent "
+    "or automation service, extract: target_market (who buys), service_description (what they sell), "
+    "and revenue (if stated). Return JSON array with the fields for each input item. Use 'unknown' if unclear."
+)
+
+def _llm_refine_batch(batch: List[Dict[str, Any]], thread_title: str, api_key: str) -> List[Dict[str, Any]]:
+    """One chat completion for a batch of comments; returns the parsed JSON array (may be shorter)."""
+    comments = "\n\n".join(f"[{i + 1}] {row['body']}" for i, row in enumerate(batch))
+    prompt = (
+        f"Thread: {thread_title}\n"
+        f"Return a JSON array of exactly {len(batch)} objects, one per numbered comment, in order.\n\n"
+        f"{comments}\n"
+    )
+    body = json.dumps({
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "system", "content": LLM_SYSTEM}, {"role": "user", "content": prompt}],
+        "temperature": 0.2
+    }).encode("utf-8")
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    resp_json = json.loads(http_request(LLM_URL, "POST", body, headers, timeout=40).decode("utf-8"))
+
+    content = resp_json["choices"][0]["message"]["content"].strip()
+    if content.startswith("```"):  # tolerate ```json fences
+        content = content.strip("`").removeprefix("json").strip()
+    arr = json.loads(content)
+    return arr if isinstance(arr, list) else []
+
+def maybe_llm_refine(rows: List[Dict[str, Any]], thread_title: str) -> bool:
+    """Fill LLM fields in place; returns True if any row was updated."""
     api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        return
-    try:
-        import json as _json
-        import urllib.request as _ureq
-
-        system = (
-            "You are a concise analyst. For each Reddit comment, if it clearly describes selling an AI agent "
-            "or automation service, extract: target_market (who buys), service_description (what they sell), "
-            "and revenue (if stated). Return JSON array with the fields for each input item. Use 'unknown' if unclear."
-        )
-
-        url = "https://api.openai.com/v1/chat/completions"
-        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-
-        chunk = []
-        mapping = []
-        for i, row in enumerate(rows):
-            payload = {"role": "user", "content": f"Thread: {thread_title}\nComment: {row['body']}\n"}
-            chunk.append(payload)
-            mapping.append(i)
-
-        if not chunk:
-            return
-
-        body = _json.dumps({
-            "model": "gpt-4o-mini",
-            "messages": [{"role":"system","content":system}] + chunk,
-            "temperature": 0.2
-        }).encode("utf-8")
-
-        req = _ureq.Request(url, data=body, headers=headers, method="POST")
-        with _ureq.urlopen(req, timeout=40) as resp:
-            resp_json = _json.loads(resp.read().decode("utf-8"))
-
-        content = resp_json["choices"][0]["message"]["content"]
-        try:
-            arr = _json.loads(content)
-            if isinstance(arr, list):
-                for i, item in enumerate(arr):
-                    idx = mapping[i]
-                    rows[idx]["target_market"] = item.get("target_market", rows[idx]["target_market"])
-                    rows[idx]["service_description"] = item.get("service_description", rows[idx]["service_description"])
-                    if not rows[idx]["extracted_revenue"] and item.get("revenue"):
-                        rows[idx]["extracted_revenue"] = item["revenue"]
-        except Exception:
-            pass
-    except Exception:
-        return
+    if not api_key or not rows:
+        return False
+    refined = False
+
+    # Batches run concurrently; a batch that fails or returns bad JSON only loses its own rows.
+    with ThreadPoolExecutor(max_workers=LLM_WORKERS) as pool:
+        futures = {
+            pool.submit(_llm_refine_batch, rows[start:start + LLM_BATCH_SIZE], thread_title, api_key): start
+            for start in range(0, len(rows), LLM_BATCH_SIZE)
+        }
+        for fut in as_completed(futures):
+            start = futures[fut]
+            try:
+                arr = fut.result()
+            except Exception:
+                continue
+            for idx, item in enumerate(arr[:LLM_BATCH_SIZE], start):
+                if idx >= len(rows) or not isinstance(item, dict):
+                    continue
+                rows[idx]["target_market"] = item.get("target_market", rows[idx]["target_market"])
+                rows[idx]["service_description"] = item.get("service_description", rows[idx]["service_description"])
+                if not rows[idx]["extracted_revenue"] and item.get("revenue"):
+                    rows[idx]["extracted_revenue"] = item["revenue"]
+                refined = True
+    return refined
+
+def write_csv(path: str, thread_meta: List[Any], rows: List[Dict[str, Any]]) -> None:
+    with open(path, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER) as f:
+        w = csv.writer(f)
+        w.writerow(CSV_HEADER)
+        w.writerows(csv_row(thread_meta, r) for r in rows)
+
+def write_markdown(path: str, thread_meta: List[Any], selftext: str, rows: List[Dict[str, Any]]) -> None:
+    title, subreddit, author, thread_permalink, created = thread_meta
+    parts = [f"# {title}\n\n"]
+    if selftext:
+        parts.append(f"> {selftext}\n\n")
+    parts.append(f"- Subreddit: r/{subreddit}\n- Author: u/{author}\n- URL: {thread_permalink}\n- Created: {created}\n\n")
+    parts.append("## Interesting replies (filtered)\n\n")
+    for r in sorted(rows, key=lambda x: (-x["score"], -(x["ups"] or 0))):
+        parts.append(f"### Score {r['score']} — {r['author']} — ups: {r['ups']}\n")
+        if r["extracted_revenue"]:
+            parts.append(f"- **Revenue:** {r['extracted_revenue']}\n")
+        if r["target_market"]:
+            parts.append(f"- **Target market:** {r['target_market']}\n")
+        if r["service_description"]:
+            parts.append(f"- **Service:** {r['service_description']}\n")
+        if r.get("quantitative_evidence"):
+            parts.append(f"- **Quantitative evidence:** {r['quantitative_evidence']}\n")
+        parts.append(f"- **Permalink:** {r['permalink']}\n\n{r['summary']}\n\n---\n\n")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
 
 def main():
     ap = argparse.ArgumentParser()
@@ -272,90 +508,79 @@ def main():
     ap.add_argument("--out", default="reddit_thread", help="Output basename (no extension)")
     ap.add_argument("--min_score", type=int, default=4, help="Minimum heuristic score to keep a comment")
     ap.add_argument("--allow_no_numbers", action="store_true", help="Do NOT require numeric evidence in comments")
+    ap.add_argument("--no_cache", action="store_true", help=f"Always re-download the thread (cache: {CACHE_DIR}, {CACHE_TTL}s TTL)")
     args = ap.parse_args()
 
     json_url = to_json_url(args.url)
-    post, comments_listing = load_thread(json_url)
-    title = html.unescape(post.get("title", "").strip())
-    selftext = html.unescape(post.get("selftext", "").strip())
+    post, comments_listing = load_thread(json_url, use_cache=not args.no_cache)
+    title = _unescape(post.get("title", "").strip())
+    selftext = _unescape(post.get("selftext", "").strip())
     subreddit = post.get("subreddit")
     thread_permalink = "https://www.reddit.com" + post.get("permalink", "")
-    created = datetime.utcfromtimestamp(post.get("created_utc", 0)).isoformat() + "Z"
+    created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(post.get("created_utc", 0)))
     author = post.get("author")
 
+    thread_meta = [title, subreddit, author, thread_permalink, created]
+    # Bodies are only kept around when the LLM pass may still change the CSV fields.
+    refine = bool(os.environ.get("OPENAI_API_KEY"))
+
     flat = flatten_comments(comments_listing)
     rows = []
-    for c in flat:
-        body = html.unescape(c.get("body", "") or "")
-        if not body.strip():
-            continue
-
-        # Hard requirement: quantitative evidence unless --allow_no_numbers supplied
-        has_nums, num_details = has_quantitative(body)
-        if not args.allow_no_numbers and not has_nums:
-            continue
-
-        score, details = score_comment(body)
-        if score < args.min_score:
-            continue
-
-        revenue_norm = extract_best_money(details["money_spans"])
-        rows.append({
-            "score": score,
-            "reasons": ",".join(sorted(set(
-                (['money_mention'] if details.get('money_spans') else []) +
-                (['market_hint'] if details.get('markets_found') else []) +
-                (['has_numbers'] if has_nums else [])
-            ))),
-            "extracted_revenue": revenue_norm or "",
-            "target_market": ", ".join(details["markets_found"]) if details["markets_found"] else "",
-            "service_description": "",
-            "quantitative_evidence": "; ".join(
-                f"{k}:{', '.join(v)}" for k, v in num_details.items() if v
-            ),
-            "comment_id": c.get("id"),
-            "author": c.get("author"),
-            "ups": c.get("ups"),
-            "permalink": "https://www.reddit.com" + c.get("permalink", ""),
-            "body": body
-        })
-
-    maybe_llm_refine(rows, title)
-
     csv_path = f"{args.out}.csv"
-    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+    with open(csv_path, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER) as f:
         w = csv.writer(f)
-        w.writerow([
-            "thread_title","subreddit","thread_author","thread_url","thread_created_utc",
-            "comment_score","comment_author","comment_ups","extracted_revenue",
-            "target_market","service_description","quantitative_evidence","permalink","body"
-        ])
-        for r in rows:
-            w.writerow([
-                title, subreddit, author, thread_permalink, created,
-                r["score"], r["author"], r["ups"], r["extracted_revenue"],
-                r["target_market"], r["service_description"], r.get("quantitative_evidence",""), r["permalink"], r["body"]
-            ])
-
+        w.writerow(CSV_HEADER)
+        for c in flat:
+            body = _unescape(c.get("body", "") or "")
+            if not body.strip():
+                continue
+
+            # Hard requirement: quantitative evidence unless --allow_no_numbers supplied
+            if RE_DIGIT.search(body) is None:
+                if not args.allow_no_numbers:
+                    continue
+                has_nums, num_details = False, {}
+            else:
+                has_nums, num_details = has_quantitative(body)
+                if not args.allow_no_numbers and not has_nums:
+                    continue
+
+            # money matches come out of score_comment on the lowercased body
+            score, reasons, details = score_comment(body.lower())
+            if score < args.min_score:
+                continue
+
+            revenue_norm = extract_best_money(details["money_matches"])
+            r = {
+                "score": score,
+                "reasons": ",".join(sorted(reasons + [REASON_NUMBERS] if has_nums else reasons)),
+                "extracted_revenue": revenue_norm or "",
+                "target_market": ", ".join(details["markets_found"]) if details["markets_found"] else "",
+                "service_description": "",
+                "quantitative_evidence": "; ".join(
+                    f"{k}:{', '.join(v)}" for k, v in num_details.items() if v
+                ),
+                "comment_id": c.get("id"),
+                "author": c.get("author"),
+                "ups": c.get("ups"),
+                "permalink": "https://www.reddit.com" + c.get("permalink", ""),
+                "body": body,
+            }
+            w.writerow(csv_row(thread_meta, r))
+            r["summary"] = summarize_text(body, 1000)
+            if not refine:
+                del r["body"]
+            rows.append(r)
+
+    # The LLM pass only refines optional fields: write the report right away
+    # and rewrite both files once (and if) it comes back with something.
     md_path = f"{args.out}.md"
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.write(f"# {title}\n\n")
-        if selftext:
-            f.write(f"> {selftext}\n\n")
-        f.write(f"- Subreddit: r/{subreddit}\n- Author: u/{author}\n- URL: {thread_permalink}\n- Created: {created}\n\n")
-        f.write("## Interesting replies (filtered)\n\n")
-        for r in sorted(rows, key=lambda x: (-x["score"], -(x["ups"] or 0))):
-            f.write(f"### Score {r['score']} — {r['author']} — ups: {r['ups']}\n")
-            if r["extracted_revenue"]:
-                f.write(f"- **Revenue:** {r['extracted_revenue']}\n")
-            if r["target_market"]:
-                f.write(f"- **Target market:** {r['target_market']}\n")
-            if r["service_description"]:
-                f.write(f"- **Service:** {r['service_description']}\n")
-            if r.get("quantitative_evidence"):
-                f.write(f"- **Quantitative evidence:** {r['quantitative_evidence']}\n")
-            f.write(f"- **Permalink:** {r['permalink']}\n\n")
-            f.write(f"{summarize_text(r['body'], 1000)}\n\n---\n\n")
+    with ThreadPoolExecutor(max_workers=1) as bg:
+        pending = bg.submit(maybe_llm_refine, rows, title) if refine else None
+        write_markdown(md_path, thread_meta, selftext, rows)
+        if pending is not None and pending.result():
+            write_csv(csv_path, thread_meta, rows)
+            write_markdown(md_path, thread_meta, selftext, rows)
 
     print(f"Wrote: {csv_path} and {md_path}")
     return 0
@@ -5,12 +5,26 @@ import csv
 import random
 import argparse
 import base64
-from dataclasses import dataclass
+import hashlib
+import json
+import mmap
+import sqlite3
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Executor
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from operator import attrgetter
 from typing import List, Optional, Dict, Tuple
 from dotenv import load_dotenv
 import praw
 import requests
 from prawcore.exceptions import RequestException, ResponseException, ServerError
+try:
+    import ahocorasick  # optionnel : pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
 
 load_dotenv()
 
@@ -19,16 +33,31 @@ parser = argparse.ArgumentParser(description="Scrape Reddit social proof about A
 parser.add_argument("--notion", action="store_true", help="Push entries to Notion database.")
 parser.add_argument("--notion-files", action="store_true", help="Append MD/CSV as file blocks to NOTION_BLOCK_ID (requires public URLs).")
 parser.add_argument("--upload-target", choices=["gist", "repo"], help="Where to upload the files to get public URLs (GitHub Gist or GitHub Repo).")
+parser.add_argument("--no-cache", action="store_true", help="Ignore the on-disk cache of previous runs (re-fetch and re-score everything).")
 args = parser.parse_args()
 
 # --- Reddit Auth ---
-reddit = praw.Reddit(
-    client_id=os.getenv("REDDIT_CLIENT_ID"),
-    client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
-    user_agent=os.getenv("REDDIT_USER_AGENT", "ai-agents-scraper"),
-    username=os.getenv("REDDIT_USERNAME"),
-    password=os.getenv("REDDIT_PASSWORD"),
-)
+def make_reddit() -> praw.Reddit:
+    return praw.Reddit(
+        client_id=os.getenv("REDDIT_CLIENT_ID"),
+        client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
+        user_agent=os.getenv("REDDIT_USER_AGENT", "ai-agents-scraper"),
+        username=os.getenv("REDDIT_USERNAME"),
+        password=os.getenv("REDDIT_PASSWORD"),
+    )
+
+reddit = make_reddit()
+
+# PRAW n'est pas thread-safe : une instance par thread de travail
+_reddit_local = threading.local()
+
+def _thread_reddit() -> praw.Reddit:
+    if threading.current_thread() is threading.main_thread():
+        return reddit
+    r = getattr(_reddit_local, "reddit", None)
+    if r is None:
+        r = _reddit_local.reddit = make_reddit()
+    return r
 
 # --- Config ---
 SUBREDDITS = [
@@ -49,11 +78,16 @@ SEARCH_QUERIES = [
 ]
 MAX_THREADS_PER_QUERY = 15
 MAX_COMMENTS_PER_THREAD = 100  # pagine si besoin
+SEARCH_WORKERS = int(os.getenv("SEARCH_WORKERS", "8"))  # recherches (sub, query) en parallèle
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", "8"))    # threads dont on télécharge les commentaires en parallèle
+SCORE_WORKERS = int(os.getenv("SCORE_WORKERS", str(os.cpu_count() or 1)))  # process de scoring (1 = un seul thread)
 
 # --- Notion IDs (via .env)
 NOTION_API_KEY = os.getenv("NOTION_API_KEY", "")
 NOTION_DATABASE_ID = os.getenv("NOTION_DATABASE_ID", "")  # DB pour les entrées (si --notion)
 NOTION_BLOCK_ID = os.getenv("NOTION_BLOCK_ID", "")        # Bloc pour les fichiers (si --notion-files)
+NOTION_MIN_INTERVAL = 1 / 3  # Notion limite à ~3 requêtes/s en moyenne
+NOTION_WORKERS = 3           # pages créées en parallèle (la cadence reste globale)
 
 # --- GitHub / Gist ---
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
@@ -62,9 +96,14 @@ GITHUB_BRANCH = os.getenv("GITHUB_BRANCH", "main")
 GITHUB_PATH_PREFIX = os.getenv("GITHUB_PATH_PREFIX", "scraping").strip("/")
 GIST_DESCRIPTION = os.getenv("GIST_DESCRIPTION", "Reddit scraping exports")
 
+# --- Cache entre les runs (SQLite) ---
+CACHE_DB = os.getenv("REDDIT_CACHE_DB", "reddit_cache.db")
+CACHE_TTL = int(os.getenv("REDDIT_CACHE_TTL", str(6 * 3600)))  # un thread inchangé n'est pas re-téléchargé avant ce délai (s)
+CACHE_VERSION = 2  # à incrémenter quand l'extraction/le scoring change : le cache est alors vidé
+
 # --- Extraction helpers ---
 CURRENCY_MAP = {"€": "EUR", "$": "USD", "£": "GBP"}
-CURRENCY_CODES = {"eur", "usd", "gbp", "€", "$", "£"}
+CURRENCY_CODES = frozenset({"eur", "usd", "gbp", "€", "$", "£"})
 
 REVENUE_PATTERNS = re.compile(
     r"""
@@ -83,38 +122,82 @@ REVENUE_PATTERNS = re.compile(
     """,
     re.VERBOSE
 )
-
-SERVICE_CUES = [
+# REVENUE_PATTERNS exige au moins un chiffre : sans chiffre, inutile de lancer la regex complète
+HAS_DIGIT = re.compile(r"\d")
+CURRENCY_SYMBOLS = "$€£"
+# le scoring ne lit qu'une fenêtre autour du montant : coût borné même pour un commentaire de 10k+ caractères
+SCORE_CONTEXT_BEFORE = 500
+SCORE_CONTEXT_AFTER = 1500
+
+SERVICE_CUES = (
     "openai", "assistants api", "gpt-4", "gpt-4o", "anthropic", "claude",
     "cohere", "langchain", "llamaindex", "crewai", "autogen", "openagents",
     "flowise", "n8n", "zapier", "make.com", "make (integromat)", "relevance ai",
     "agentops", "vercel ai sdk", "modal", "bedrock", "vertex ai", "hugging face",
     "groq", "ollama"
-]
+)
+
+# ordre d'affichage de find_services : plus long d'abord, à égalité l'ordre de SERVICE_CUES
+SERVICE_CUES_SORTED = sorted(dict.fromkeys(SERVICE_CUES), key=len, reverse=True)
 
-NICHE_PIVOTS = [
+NICHE_PIVOTS = (
     "for ", "pour ", "to help ", "serving ", "targeting ",
     "for helping ", "aider ", "auprès des ", "with "
-]
+)
+NICHE_NEEDLES = tuple(" " + p for p in NICHE_PIVOTS)  # pivot précédé d'un espace, dans l'ordre de priorité
 
-SUCCESS_CUES = [
+SUCCESS_CUES = (
     "paying customer", "paying customers", "mrr", "arr", "profitable",
     "sold", "closed", "booked", "recurring", "retain", "retainer",
     "works well", "working well", "it works", "fonctionne", "ça marche",
     "clients payent", "clients payants",
-]
-DOUBT_CUES = [
+)
+DOUBT_CUES = (
     "anyone making", "anyone here", "how to", "question", "help",
     "struggling", "trying", "explore", "exploring", "idea", "idée",
     "en cours", "hésite", "tester", "tests", "proof of concept", "poc"
-]
-FAIL_CUES = [
+)
+FAIL_CUES = (
     "failed", "no sales", "can't monetize", "cannot monetize", "didn't sell",
     "aucune vente", "pas de vente", "impossible à monétiser", "échec"
-]
+)
 
-APPROX_CUES = ["~", "≈", "about", "around", "approx", "approximately", "environ", "roughly", "presque"]
+APPROX_CUES = ("~", "≈", "about", "around", "approx", "approximately", "environ", "roughly", "presque")
 RANGE_PATTERN = re.compile(r"\b\d+(?:[.,]?\d+)?\s*[-–]\s*\d+(?:[.,]?\d+)?\b")
+NICHE_STOP = re.compile(r"[.?!;:()\[\]{}|/\\]")  # fin de la niche : ponctuation
+COMPANY_PATTERN = re.compile(r"\b[A-Z][A-Za-z0-9&.\-]{2,}\b(?:\s(?:Inc|LLC|Ltd|SAS|GmbH|SARL|AG)\b)")
+THOUSANDS_SEP = str.maketrans("", "", ".,")
+
+CLIENT_CUES = (
+    "client", "customer", "customers", "clients", "smb", "realtor", "realtors",
+    "law firm", "lawyer", "attorney", "restaurant", "ecom", "saas", "agency", "agencies"
+)
+
+# Catégories de cues cherchées en une passe par commentaire (cf. scan_cues)
+CUE_CATEGORIES = {
+    "service": SERVICE_CUES,
+    "success": SUCCESS_CUES,
+    "doubt": DOUBT_CUES,
+    "fail": FAIL_CUES,
+    "client": CLIENT_CUES,
+    "currency": CURRENCY_CODES,
+    "approx": APPROX_CUES,
+}
+
+def _build_cue_automaton():
+    if ahocorasick is None:
+        return None
+    cats_by_cue: Dict[str, List[str]] = {}
+    for cat, cues in CUE_CATEGORIES.items():
+        for cue in cues:
+            cats_by_cue.setdefault(cue.lower(), []).append(cat)
+    automaton = ahocorasick.Automaton()
+    for cue, cats in cats_by_cue.items():
+        automaton.add_word(cue, (cue, tuple(cats)))
+    automaton.make_automaton()
+    return automaton
+
+CUE_AUTOMATON = _build_cue_automaton()
 
 @dataclass
 class Evidence:
@@ -134,7 +217,7 @@ def _to_float_amount(amount_str: str) -> Optional[float]:
     s = amount_str.strip().replace(" ", "").replace("’", "").replace("˙", ".")
     if "," in s and "." in s:
         last = max(s.rfind(","), s.rfind("."))
-        int_part = re.sub(r"[.,]", "", s[:last])
+        int_part = s[:last].translate(THOUSANDS_SEP)
         frac_part = s[last+1:]
         s = f"{int_part}.{frac_part}"
     else:
@@ -145,6 +228,22 @@ def _to_float_amount(amount_str: str) -> Optional[float]:
     except ValueError:
         return None
 
+def find_revenue(body: str) -> Optional[re.Match]:
+    """Same result as REVENUE_PATTERNS.search(body), without trying the pattern at every position.
+
+    The amount needs a digit, so the first match starts at the first digit,
+    moved back over the "[$€£]?\\s*" the pattern allows in front of it.
+    """
+    d = HAS_DIGIT.search(body)
+    if d is None:
+        return None
+    i = d.start()
+    while i and body[i - 1].isspace():
+        i -= 1
+    if i and body[i - 1] in CURRENCY_SYMBOLS:
+        i -= 1
+    return REVENUE_PATTERNS.match(body, i)
+
 def normalize_revenue(m: re.Match) -> Tuple[Optional[float], Optional[str], Optional[str], str]:
     original = m.group(0).strip()
     currency_sym = m.group("currency") or ""
@@ -164,59 +263,74 @@ def normalize_revenue(m: re.Match) -> Tuple[Optional[float], Optional[str], Opti
         amount *= 1_000_000
 
     period = None
-    if any(u in unit for u in ["mo", "month", "mois", "/m"]):
+    if any(u in unit for u in ("mo", "month", "mois", "/m")):
         period = "month"
-    elif any(u in unit for u in ["wk", "w", "week", "semaine", "sem"]):
+    elif any(u in unit for u in ("wk", "w", "week", "semaine", "sem")):
         period = "week"
-    elif any(u in unit for u in ["d", "day", "jour", "j"]):
+    elif any(u in unit for u in ("d", "day", "jour", "j")):
         period = "day"
-    elif any(u in unit for u in ["yr", "y", "year", "an", "année", "ans"]):
+    elif any(u in unit for u in ("yr", "y", "year", "an", "année", "ans")):
         period = "year"
 
     return amount, currency, period, original
 
+def scan_cues(body_lower: str, title_lower: str = "") -> Dict[str, set]:
+    """Cues found per category (substring semantics, overlaps included).
+
+    Only "service" also looks at the title (stack points count tools named in
+    the thread title too). One Aho-Corasick pass when pyahocorasick is
+    installed, plain substring checks otherwise; in that fallback the other
+    categories only report their first hit, since callers only test presence.
+    """
+    text = f"{body_lower} {title_lower}" if title_lower else body_lower
+    hits: Dict[str, set] = {cat: set() for cat in CUE_CATEGORIES}
+    if CUE_AUTOMATON is not None:
+        n = len(body_lower)
+        for end, (cue, cats) in CUE_AUTOMATON.iter(text):
+            for cat in cats:
+                if end < n or cat == "service":
+                    hits[cat].add(cue)
+    else:
+        hits["service"].update(c for c in SERVICE_CUES if c in text)
+        for cat, cues in CUE_CATEGORIES.items():
+            if cat == "service":
+                continue
+            for c in cues:
+                if c in body_lower:
+                    hits[cat].add(c)
+                    break
+    return hits
+
 def find_services(text: str) -> str:
-    t = text.lower()
-    hits = [s for s in SERVICE_CUES if s in t]
-    hits = sorted(set(hits), key=len, reverse=True)
-    return ", ".join(hits)
-
-def find_niche(text: str) -> str:
-    t = " " + text.replace("\n", " ") + " "
-    for p in NICHE_PIVOTS:
-        idx = t.lower().find(" " + p)
+    tl = text.lower()
+    return ", ".join(c for c in SERVICE_CUES_SORTED if c in tl)
+
+def find_niche(text: str, text_lower: Optional[str] = None) -> str:
+    tl = f" {text.lower() if text_lower is None else text_lower} ".replace("\n", " ")
+    for p in NICHE_NEEDLES:
+        idx = tl.find(p)
         if idx != -1:
-            start = idx + 1 + len(p)
-            tail = t[start:]
-            words = tail.split()
-            snippet = " ".join(words[:12])
-            snippet = re.split(r"[.?!;:()\[\]{}|/\\]", snippet)[0]
+            # tl a un espace de plus en tête que text ; on ne découpe que les 12 premiers mots
+            words = text[idx + len(p) - 1:].split(None, 12)[:12]
+            snippet = NICHE_STOP.split(" ".join(words), 1)[0]
             return snippet.strip()
     return ""
 
-def _text_has_any(text: str, cues: List[str]) -> bool:
-    t = text.lower()
-    return any(c in t for c in cues)
-
-def _has_currency_code(text: str) -> bool:
-    t = text.lower()
-    return any(code in t for code in CURRENCY_CODES)
-
-def _detect_period(unit_text: Optional[str], full_text: str) -> Optional[str]:
+def _detect_period(unit_text: Optional[str], full_text_lower: str) -> Optional[str]:
     u = (unit_text or "").lower()
-    ft = (full_text or "").lower()
-    if any(k in u for k in ["d", "day", "jour", "j"]) or any(k in ft for k in [" per day", "/d", "par jour"]):
+    ft = full_text_lower or ""
+    if any(k in u for k in ("d", "day", "jour", "j")) or any(k in ft for k in (" per day", "/d", "par jour")):
         return "day"
-    if any(k in u for k in ["wk", "w", "week", "semaine", "sem"]) or any(k in ft for k in [" per week", "/wk", "/w", "par semaine"]):
+    if any(k in u for k in ("wk", "w", "week", "semaine", "sem")) or any(k in ft for k in (" per week", "/wk", "/w", "par semaine")):
         return "week"
-    if any(k in u for k in ["mo", "month", "mois", "m"]) or any(k in ft for k in [" per month", "/mo", "/m", "par mois"]):
+    if any(k in u for k in ("mo", "month", "mois", "m")) or any(k in ft for k in (" per month", "/mo", "/m", "par mois")):
         return "month"
-    if any(k in u for k in ["yr", "y", "year", "an", "année", "ans"]) or any(k in ft for k in [" per year", "/yr", "/y", "par an", "par année"]):
+    if any(k in u for k in ("yr", "y", "year", "an", "année", "ans")) or any(k in ft for k in (" per year", "/yr", "/y", "par an", "par année")):
         return "year"
     return None
 
-def _precision_points(body: str, rev_text: str) -> int:
-    approx = _text_has_any(rev_text, APPROX_CUES) or _text_has_any(body, APPROX_CUES)
+def _precision_points(cues: Dict[str, set], body: str, rev_text: str) -> int:
+    approx = bool(cues["approx"])  # rev_text fait partie du body
     ranged = bool(RANGE_PATTERN.search(rev_text)) or bool(RANGE_PATTERN.search(body))
     if approx or ranged:
         return 5
@@ -233,46 +347,44 @@ def _period_points(period: Optional[str]) -> int:
         return 15
     return 5 if period else 0
 
-def _market_points(body: str) -> int:
-    has_niche = bool(find_niche(body))
+def _market_points(cues: Dict[str, set], body: str, body_lower: str) -> int:
+    has_niche = bool(find_niche(body, body_lower))
     pts = 10 if has_niche else 0
-    client_cues = [
-        "client", "customer", "customers", "clients", "smb", "realtor", "realtors",
-        "law firm", "lawyer", "attorney", "restaurant", "ecom", "saas", "agency", "agencies"
-    ]
-    named = _text_has_any(body, client_cues) or bool(
-        re.search(r"\b[A-Z][A-Za-z0-9&.\-]{2,}\b(?:\s(?:Inc|LLC|Ltd|SAS|GmbH|SARL|AG)\b)", body)
-    )
+    named = bool(cues["client"]) or bool(COMPANY_PATTERN.search(body))
     pts += 10 if named else 0
     return pts
 
-def _stack_points(body: str, title: str) -> int:
-    merged = (body + " " + title).lower()
-    hits = [s for s in SERVICE_CUES if s in merged]
-    return min(15, 3 * len(set(hits)))
+def _stack_points(cues: Dict[str, set]) -> int:
+    return min(15, 3 * len(cues["service"]))
 
-def _sentiment_points(body: str) -> int:
-    t = body.lower()
-    if _text_has_any(t, FAIL_CUES):
+def _sentiment_points(cues: Dict[str, set]) -> int:
+    if cues["fail"]:
         return -999  # échec => score total 0
-    if _text_has_any(t, SUCCESS_CUES):
+    if cues["success"]:
         return 10
-    if _text_has_any(t, DOUBT_CUES):
+    if cues["doubt"]:
         return 5
     return 7  # défaut légèrement positif si revenu existe
 
-def compute_score_v2(body: str, submission_title: str, rev_match: re.Match, currency: Optional[str], unit: Optional[str]) -> int:
+def compute_score_v2(body: str, submission_title: str, rev_match: re.Match, currency: Optional[str], unit: Optional[str],
+                     body_lower: Optional[str] = None, title_lower: Optional[str] = None) -> int:
+    # lowercase une seule fois par commentaire (et par titre), partagé par tous les helpers
+    if body_lower is None:
+        body_lower = body.lower()
+    if title_lower is None:
+        title_lower = submission_title.lower()
+    cues = scan_cues(body_lower, title_lower)
     base = 25
-    currency_pts = 5 if (currency or _has_currency_code(body)) else 0
-    period = _detect_period(unit, body)
+    currency_pts = 5 if (currency or cues["currency"]) else 0
+    period = _detect_period(unit, body_lower)
     period_pts = _period_points(period)
-    precision_pts = _precision_points(body, rev_match.group(0))
+    precision_pts = _precision_points(cues, body, rev_match.group(0))
     revenue_pts = base + currency_pts + period_pts + precision_pts  # max 55
 
-    market_pts = _market_points(body)    # max 20
-    stack_pts = _stack_points(body, submission_title)  # max 15
+    market_pts = _market_points(cues, body, body_lower)    # max 20
+    stack_pts = _stack_points(cues)  # max 15
 
-    sent = _sentiment_points(body)
+    sent = _sentiment_points(cues)
     if sent < 0:
         return 0
     sentiment_pts = sent  # 0..10
@@ -292,30 +404,80 @@ class Evidence:
     post: str
     score: int
 
-def extract_evidence(subreddit, submission, comment) -> Optional[Evidence]:
-    body = comment.body if hasattr(comment, "body") else ""
+@lru_cache(maxsize=1024)
+def _title_lower(title: str) -> str:
+    return title.lower()  # même titre pour tous les commentaires d'un thread
+
+def score_body(body: str, title: str, subreddit: str, thread_url: str, comment_url: str, author: str) -> Optional[Evidence]:
+    """Evidence for one comment, or None. Plain values only, so it can run in a worker process."""
     if not body:
         return None
 
-    rev_match = REVENUE_PATTERNS.search(body)
+    rev_match = find_revenue(body)
     if not rev_match:
         return None
 
     value, currency, period, rev_text = normalize_revenue(rev_match)
     unit = rev_match.group("unit") if rev_match else None
 
-    score = compute_score_v2(body, submission.title, rev_match, currency, unit)
+    ctx = body[max(0, rev_match.start() - SCORE_CONTEXT_BEFORE):rev_match.end() + SCORE_CONTEXT_AFTER]
+    score = compute_score_v2(ctx, title, rev_match, currency, unit,
+                             body_lower=ctx.lower(), title_lower=_title_lower(title))
 
     return Evidence(
-        subreddit=subreddit.display_name if hasattr(subreddit, "display_name") else str(subreddit),
-        thread_title=submission.title,
-        thread_url=f"https://www.reddit.com{submission.permalink}",
-        comment_url=f"https://www.reddit.com{comment.permalink}",
-        author=str(comment.author) if comment.author else "[deleted]",
+        subreddit=subreddit,
+        thread_title=title,
+        thread_url=thread_url,
+        comment_url=comment_url,
+        author=author,
         post=body.strip(),
         score=score
     )
 
+# PRAW charge certains attributs paresseusement : chacun n'est lu qu'une fois, ensuite on ne passe que des str
+def thread_fields(subreddit, submission) -> Tuple[str, str, str]:
+    """(title, subreddit name, thread_url), read once for all the comments of a thread."""
+    return (
+        submission.title,
+        subreddit.display_name if hasattr(subreddit, "display_name") else str(subreddit),
+        f"https://www.reddit.com{submission.permalink}",
+    )
+
+def comment_fields(comment) -> Tuple[str, str, str]:
+    """(body, comment_url, author) of one comment."""
+    author = comment.author
+    return (
+        getattr(comment, "body", ""),
+        f"https://www.reddit.com{comment.permalink}",
+        str(author) if author else "[deleted]",
+    )
+
+def extract_evidence(subreddit, submission, comment) -> Optional[Evidence]:
+    title, sub_name, thread_url = thread_fields(subreddit, submission)
+    body, comment_url, author = comment_fields(comment)
+    return score_body(body, title, sub_name, thread_url, comment_url, author)
+
+def _score_batch(batch: List[Tuple[str, ...]]) -> List[Optional[Evidence]]:
+    """Worker (process): score_body over the comments of one thread."""
+    return [score_body(*fields) for fields in batch]
+
+@contextmanager
+def _cancel_on_error(executor: Executor):
+    """Executor as a context manager; if the block raises (Ctrl-C included), queued jobs are dropped, not run."""
+    with executor:
+        try:
+            yield executor
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+def _score_pool():
+    """Process pool for the CPU-bound scoring; a single thread if SCORE_WORKERS <= 1."""
+    if SCORE_WORKERS > 1:
+        # spawn : on ne forke pas un process qui fait déjà tourner des threads (téléchargements, PRAW)
+        return ProcessPoolExecutor(max_workers=SCORE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return ThreadPoolExecutor(max_workers=1)
+
 # --- Rate limit/backoff & Reddit crawling ---
 
 def backoff_sleep(base=1.0, factor=2.0, jitter=True, attempt=1, cap=60):
@@ -324,37 +486,43 @@ def backoff_sleep(base=1.0, factor=2.0, jitter=True, attempt=1, cap=60):
         sleep_for += random.uniform(0, 0.5)
     time.sleep(sleep_for)
 
-def search_threads() -> List[Tuple[str, str]]:
+def _search_one(sub: str, q: str) -> List[Tuple[str, str, int]]:
+    sr = _thread_reddit().subreddit(sub)
+    attempt = 1
+    while True:
+        found = []
+        try:
+            for submission in sr.search(q, sort="new", limit=MAX_THREADS_PER_QUERY):
+                found.append((sub, submission.id, submission.num_comments))
+            return found
+        except (ServerError, ResponseException, RequestException) as e:
+            if "404" in str(e):
+                print(f"[INFO] Skipped r/{sub}: search not allowed (404).")
+                return found
+            backoff_sleep(attempt=attempt)
+            attempt += 1
+            if attempt > 5:
+                print(f"[WARN] search '{q}' on r/{sub} gave persistent errors: {e}")
+                return found
+
+def search_threads() -> List[Tuple[str, str, int]]:
+    # I/O-bound : les (sub, query) tournent en parallèle, le rate limiter de PRAW régule
     results = []
     seen_ids = set()
-    for sub in SUBREDDITS:
-        sr = reddit.subreddit(sub)
-        for q in SEARCH_QUERIES:
-            attempt = 1
-            while True:
-                try:
-                    for submission in sr.search(q, sort="new", limit=MAX_THREADS_PER_QUERY):
-                        if submission.id not in seen_ids:
-                            seen_ids.add(submission.id)
-                            results.append((sub, submission.id))
-                    time.sleep(0.5)
-                    break
-                except (ServerError, ResponseException, RequestException) as e:
-                    if "404" in str(e):
-                        print(f"[INFO] Skipped r/{sub}: search not allowed (404).")
-                        break
-                    backoff_sleep(attempt=attempt)
-                    attempt += 1
-                    if attempt > 5:
-                        print(f"[WARN] search '{q}' on r/{sub} gave persistent errors: {e}")
-                        break
+    with _cancel_on_error(ThreadPoolExecutor(max_workers=SEARCH_WORKERS)) as pool:
+        futures = [pool.submit(_search_one, sub, q) for sub in SUBREDDITS for q in SEARCH_QUERIES]
+        for fut in futures:  # ordre de soumission => résultat déterministe
+            for sub, sid, num_comments in fut.result():
+                if sid not in seen_ids:
+                    seen_ids.add(sid)
+                    results.append((sub, sid, num_comments))
     return results
 
 def fetch_comments(submission_id: str, limit=MAX_COMMENTS_PER_THREAD):
     attempt = 1
     while True:
         try:
-            submission = reddit.submission(id=submission_id)
+            submission = _thread_reddit().submission(id=submission_id)
             submission.comments.replace_more(limit=0)
             comments = submission.comments.list()
             if limit:
@@ -366,59 +534,176 @@ def fetch_comments(submission_id: str, limit=MAX_COMMENTS_PER_THREAD):
             if attempt > 5:
                 raise
 
+def _fetch_thread(sub_name: str, sub_id: str):
+    """Worker: fetch_comments, or None (logged) if the thread can't be fetched."""
+    try:
+        return fetch_comments(sub_id)
+    except Exception as e:
+        print(f"[WARN] {sub_name}/{sub_id}: {e}")
+        return None
+
+class ScrapeCache:
+    """Threads and comments seen by previous runs (SQLite file CACHE_DB).
+
+    A thread whose comment count hasn't changed since less than CACHE_TTL is
+    not re-fetched; a comment whose body hash is unchanged is not re-scored.
+    Evidence is stored as JSON so skipped items still end up in the exports.
+    """
+
+    def __init__(self, path: str = CACHE_DB):
+        self.db = sqlite3.connect(path)
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+            self.db.executescript("DROP TABLE IF EXISTS submissions; DROP TABLE IF EXISTS comments;")
+            self.db.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS submissions (
+                id TEXT PRIMARY KEY, num_comments INTEGER, last_seen_utc REAL);
+            CREATE TABLE IF NOT EXISTS comments (
+                id TEXT PRIMARY KEY, thread_id TEXT, pos INTEGER, body_sha1 BLOB, evidence TEXT);
+            CREATE INDEX IF NOT EXISTS comments_thread ON comments (thread_id);
+        """)
+
+    def thread_is_fresh(self, sub_id: str, num_comments: int) -> bool:
+        row = self.db.execute(
+            "SELECT num_comments, last_seen_utc FROM submissions WHERE id = ?", (sub_id,)
+        ).fetchone()
+        return bool(row) and row[0] == num_comments and time.time() - row[1] < CACHE_TTL
+
+    def thread_comments(self, sub_id: str) -> List[Tuple[str, Optional[Evidence]]]:
+        rows = self.db.execute(
+            "SELECT id, evidence FROM comments WHERE thread_id = ? ORDER BY pos", (sub_id,)
+        )
+        return [(cid, Evidence(**json.loads(ev)) if ev else None) for cid, ev in rows]
+
+    def comment(self, cid: str, body_hash: bytes) -> Tuple[bool, Optional[Evidence]]:
+        """(hit, evidence): hit is False when the comment is unknown or its body changed."""
+        row = self.db.execute("SELECT body_sha1, evidence FROM comments WHERE id = ?", (cid,)).fetchone()
+        if not row or row[0] != body_hash:
+            return False, None
+        return True, Evidence(**json.loads(row[1])) if row[1] else None
+
+    def forget_comments(self, sub_id: str):
+        """Drop a re-fetched thread's rows, so comments deleted since are not replayed later."""
+        self.db.execute("DELETE FROM comments WHERE thread_id = ?", (sub_id,))
+
+    def put_comment(self, cid: str, sub_id: str, pos: int, body_hash: bytes, ev: Optional[Evidence]):
+        self.db.execute(
+            "INSERT OR REPLACE INTO comments (id, thread_id, pos, body_sha1, evidence) VALUES (?, ?, ?, ?, ?)",
+            (cid, sub_id, pos, body_hash, json.dumps(asdict(ev)) if ev else None),
+        )
+
+    def put_thread(self, sub_id: str, num_comments: int):
+        self.db.execute(
+            "INSERT OR REPLACE INTO submissions (id, num_comments, last_seen_utc) VALUES (?, ?, ?)",
+            (sub_id, num_comments, time.time()),
+        )
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
 def run_scrape() -> List[Evidence]:
     seen_comments = set()
     evidences: List[Evidence] = []
     thread_refs = search_threads()
-    for sub_name, sub_id in thread_refs:
-        try:
-            submission, comments = fetch_comments(sub_id)
-            sr = reddit.subreddit(sub_name)
-            for c in comments:
-                if c.id in seen_comments:
+    cache = ScrapeCache()
+    use_cache = not args.no_cache
+    # par thread : (sub_name, sub_id, num_comments ou None, [(cid, pos, body_hash, hit, ev)], lot en cours de scoring)
+    todo = []
+    try:
+        # Téléchargements en parallèle (threads), scoring en parallèle (process) ; résultats dans l'ordre des threads
+        with _cancel_on_error(ThreadPoolExecutor(max_workers=FETCH_WORKERS)) as pool, \
+                _cancel_on_error(_score_pool()) as scorer:
+            futures = {
+                sub_id: pool.submit(_fetch_thread, sub_name, sub_id)
+                for sub_name, sub_id, num_comments in thread_refs
+                if not (use_cache and cache.thread_is_fresh(sub_id, num_comments))
+            }
+            for sub_name, sub_id, num_comments in thread_refs:
+                if sub_id not in futures:  # inchangé depuis le dernier run : rien à réécrire dans le cache
+                    items = []
+                    for cid, ev in cache.thread_comments(sub_id):
+                        if cid not in seen_comments:
+                            seen_comments.add(cid)
+                            items.append((cid, None, None, True, ev))
+                    todo.append((sub_name, sub_id, None, items, None))
                     continue
-                ev = extract_evidence(sr, submission, c)
-                if ev:
-                    evidences.append(ev)
-                seen_comments.add(c.id)
-            time.sleep(0.5)
-        except Exception as e:
-            print(f"[WARN] {sub_name}/{sub_id}: {e}")
-            time.sleep(1.0)
+                fetched = futures[sub_id].result()
+                if fetched is None:
+                    continue
+                submission, comments = fetched
+                items, batch = [], []
+                try:
+                    title, sub_display, thread_url = thread_fields(sub_name, submission)
+                    for pos, c in enumerate(comments):
+                        cid = c.id
+                        if cid in seen_comments:
+                            continue
+                        body, comment_url, author = comment_fields(c)
+                        body_hash = hashlib.sha1((body or "").encode("utf-8")).digest()[:8]
+                        hit, ev = cache.comment(cid, body_hash) if use_cache else (False, None)
+                        if not hit:
+                            batch.append((body, title, sub_display, thread_url, comment_url, author))
+                        items.append((cid, pos, body_hash, hit, ev))
+                        seen_comments.add(cid)
+                except Exception as e:
+                    print(f"[WARN] {sub_name}/{sub_id}: {e}")
+                    num_comments = None  # thread incomplet : pas marqué comme à jour
+                todo.append((sub_name, sub_id, num_comments, items, scorer.submit(_score_batch, batch) if batch else None))
+
+            for sub_name, sub_id, num_comments, items, scored in todo:
+                try:
+                    fresh = iter(scored.result() if scored else ())
+                except Exception as e:
+                    print(f"[WARN] {sub_name}/{sub_id}: {e}")
+                    continue
+                if num_comments is not None:  # thread complet : ses lignes sont réécrites, dans la transaction de put_thread
+                    cache.forget_comments(sub_id)
+                for cid, pos, body_hash, hit, ev in items:
+                    if not hit:
+                        ev = next(fresh)
+                    if pos is not None:
+                        cache.put_comment(cid, sub_id, pos, body_hash, ev)
+                    if ev:
+                        evidences.append(ev)
+                if num_comments is not None:
+                    cache.put_thread(sub_id, num_comments)
+    finally:
+        cache.close()
     return evidences
 
 # --- Exports ---
 
 CSV_PATH = "reddit_ai_agents.csv"
 MD_PATH = "reddit_ai_agents.md"
+EXPORT_BUFFER = 1 << 20  # gros buffer : peu d'appels système même pour des milliers de lignes
+
+CSV_FIELDS = ["subreddit", "thread_url", "comment_url", "author", "post", "score"]
+CSV_ROW = attrgetter(*CSV_FIELDS)  # Evidence -> tuple dans l'ordre des colonnes
 
 def export_csv(rows: List[Evidence], path=CSV_PATH):
-    fieldnames = ["subreddit", "thread_url", "comment_url", "author", "post", "score"]
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow({
-                "subreddit": r.subreddit,
-                "thread_url": r.thread_url,
-                "comment_url": r.comment_url,
-                "author": r.author,
-                "post": r.post,
-                "score": r.score,
-            })
+    with open(path, "w", newline="", encoding="utf-8", buffering=EXPORT_BUFFER) as f:
+        w = csv.writer(f)
+        w.writerow(CSV_FIELDS)
+        w.writerows(map(CSV_ROW, rows))
     print(f"[OK] CSV -> {path}")
 
+def _markdown_entry(r: Evidence) -> str:
+    return (
+        f"## {r.thread_title}\n"
+        f"- **Score**: {r.score}\n"
+        f"- **Subreddit**: r/{r.subreddit}\n"
+        f"- **Thread**: {r.thread_url}\n"
+        f"- **Comment**: {r.comment_url}\n"
+        f"- **Auteur**: {r.author}\n"
+        f"- **Post**:\n\n> {r.post}\n\n---\n\n"
+    )
+
 def export_markdown(rows: List[Evidence], path=MD_PATH):
-    with open(path, "w", encoding="utf-8") as f:
+    with open(path, "w", encoding="utf-8", buffering=EXPORT_BUFFER) as f:
         f.write("# Reddit – Preuves sociales agents IA (triées par score décroissant)\n\n")
-        for r in rows:
-            f.write(f"## {r.thread_title}\n")
-            f.write(f"- **Score**: {r.score}\n")
-            f.write(f"- **Subreddit**: r/{r.subreddit}\n")
-            f.write(f"- **Thread**: {r.thread_url}\n")
-            f.write(f"- **Comment**: {r.comment_url}\n")
-            f.write(f"- **Auteur**: {r.author}\n")
-            f.write(f"- **Post**:\n\n> {r.post}\n\n---\n\n")
+        f.writelines(map(_markdown_entry, rows))
     print(f"[OK] Markdown -> {path}")
 
 # --- Uploaders (GitHub Gist / GitHub Repo) ---
@@ -472,6 +757,14 @@ def _repo_put_file(owner: str, repo: str, branch: str, path: str, content_b64: s
     raw_url = f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/{path}"
     return raw_url
 
+def _b64_file(fp: str) -> str:
+    """Base64 of a file, read through mmap (no extra in-memory copy of the raw bytes)."""
+    with open(fp, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""  # mmap refuse les fichiers vides
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return base64.b64encode(mm).decode("ascii")
+
 def upload_files_to_repo(file_paths: List[str]) -> Dict[str, str]:
     """Return {filename: raw_url} via GitHub repo (branch)."""
     if not (GITHUB_TOKEN and GITHUB_REPO):
@@ -481,8 +774,7 @@ def upload_files_to_repo(file_paths: List[str]) -> Dict[str, str]:
     out = {}
     for fp in file_paths:
         name = os.path.basename(fp)
-        with open(fp, "rb") as f:
-            content_b64 = base64.b64encode(f.read()).decode("utf-8")
+        content_b64 = _b64_file(fp)
         rel_path = f"{GITHUB_PATH_PREFIX}/{name}" if GITHUB_PATH_PREFIX else name
         raw = _repo_put_file(owner, repo, GITHUB_BRANCH, rel_path, content_b64, f"Upload {name} from scraper")
         if raw:
@@ -502,6 +794,52 @@ def upload_files_public(file_paths: List[str]) -> Dict[str, str]:
 
 # --- Notion push (DB entries) ---
 
+_notion_local = threading.local()
+_notion_lock = threading.Lock()
+_notion_next = 0.0     # time.monotonic() du prochain créneau libre, partagé par tous les threads
+_notion_blocked = 0.0  # aucune requête avant cet instant (relevé par un 429)
+
+def _notion_session() -> requests.Session:
+    """Keep-alive session of the current thread (no TLS handshake per page)."""
+    sess = getattr(_notion_local, "session", None)
+    if sess is None:
+        sess = _notion_local.session = requests.Session()
+    return sess
+
+def _notion_slot():
+    """Wait for the next request slot (~3 req/s overall), never inside a 429 back-off."""
+    global _notion_next
+    while True:
+        with _notion_lock:
+            now = time.monotonic()
+            at = max(now, _notion_next, _notion_blocked)
+            _notion_next = at + NOTION_MIN_INTERVAL
+        if at > now:
+            time.sleep(at - now)
+        with _notion_lock:
+            if time.monotonic() >= _notion_blocked:
+                return
+        # un 429 est arrivé pendant l'attente : créneau réservé caduc, on en reprend un après le blocage
+
+def _notion_block(delay: float):
+    """After a 429: hold every thread's requests for delay seconds."""
+    global _notion_blocked
+    with _notion_lock:
+        _notion_blocked = max(_notion_blocked, time.monotonic() + delay)
+
+def notion_request(method: str, url: str, headers: Dict, payload: Dict, attempts: int = 5) -> requests.Response:
+    """Send one paced Notion API call; on 429 wait Retry-After and retry."""
+    for attempt in range(1, attempts + 1):
+        _notion_slot()
+        r = _notion_session().request(method, url, headers=headers, json=payload, timeout=30)
+        if r.status_code != 429 or attempt == attempts:
+            return r
+        try:
+            _notion_block(float(r.headers.get("Retry-After")))
+        except (TypeError, ValueError):
+            _notion_block(min(60, 2 ** (attempt - 1)))
+    return r
+
 def push_to_notion(rows: List[Evidence]):
     if not args.notion:
         print("[INFO] --notion non fourni : pas d'insertion en base Notion.")
@@ -534,16 +872,18 @@ def push_to_notion(rows: List[Evidence]):
             }
         }
 
-    for ev in rows:
+    def push_one(payload: Dict):
         try:
-            payload = notion_page_payload(ev)
-            r = requests.post(url, headers=headers, json=payload, timeout=30)
+            r = notion_request("POST", url, headers, payload)
             if r.status_code >= 300:
                 print(f"[WARN] Notion push failed {r.status_code}: {r.text[:200]}")
-            time.sleep(0.2)
         except Exception as e:
             print(f"[WARN] Notion error: {e}")
-            time.sleep(0.5)
+
+    # plusieurs pages en vol pour masquer la latence ; _notion_slot garde la cadence globale
+    payloads = [notion_page_payload(ev) for ev in rows]
+    with _cancel_on_error(ThreadPoolExecutor(max_workers=NOTION_WORKERS)) as pool:
+        list(pool.map(push_one, payloads))
 
 # --- Notion files (append MD/CSV to a block as external file links) ---
 
@@ -581,7 +921,7 @@ def append_file_urls_to_notion_block(urls_by_name: Dict[str, str]):
 
     url = f"https://api.notion.com/v1/blocks/{NOTION_BLOCK_ID}/children"
     payload = {"children": children}
-    r = requests.patch(url, headers=headers, json=payload, timeout=30)
+    r = notion_request("PATCH", url, headers, payload)
     if r.status_code >= 300:
         print(f"[WARN] Notion files append failed {r.status_code}: {r.text[:200]}")
     else:
@@ -592,11 +932,8 @@ def append_file_urls_to_notion_block(urls_by_name: Dict[str, str]):
 if __name__ == "__main__":
     t0 = time.time()
 
-    rows = run_scrape()
-
-    # dédup par comment_url
-    uniq = {r.comment_url: r for r in rows}.values()
-    uniq = list(uniq)
+    # déjà dédupliqué par id de commentaire pendant la collecte (run_scrape)
+    uniq = run_scrape()
 
     # tri par score décroissant puis par subreddit/titre pour stabilité
     uniq.sort(key=lambda r: (-r.score, r.subreddit.lower(), r.thread_title.lower()))